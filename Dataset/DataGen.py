@@ -1,7 +1,12 @@
-import random
-from datetime import datetime, timedelta
+import itertools
+
+import numpy as np
 import pandas as pd
 
+# Shared generator for every draw in this module; pass an 'rng' (or a seed to
+# generate_all_tables) to get reproducible tables.
+_RNG = np.random.default_rng()
+
 # ------------------------------------------------
 # 1. Dictionaries to Customize Gene Expression
 # ------------------------------------------------
@@ -121,6 +126,21 @@ ETHNICITIES = [
         "Unknown"
     ]
 
+FIRST_NAMES = ["John", "Jane", "Mary", "Michael", "Sarah", "David",
+               "Anna", "Peter", "Linda", "James"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia",
+              "Miller", "Davis", "Martinez", "Wilson"]
+
+GENDERS = ["Male", "Female", "Other"]
+
+US_STATES = [
+    "AL","AK","AZ","AR","CA","CO","CT","DE","FL","GA","HI","ID","IL","IN","IA",
+    "KS","KY","LA","ME","MD","MA","MI","MN","MS","MO","MT","NE","NV","NH","NJ",
+    "NM","NY","NC","ND","OH","OK","OR","PA","RI","SC","SD","TN","TX","UT","VT",
+    "VA","WA","WV","WI","WY"
+]
+
+PROCEDURE_CODES = ["CPT-1234", "CPT-5678", "CPT-9012", "CPT-3456"]
 
 THERAPY_SEGMENT_BY_STAGE = {
     1: "First-line Therapy",
@@ -132,113 +152,135 @@ THERAPY_SEGMENT_BY_STAGE = {
 # 2. Generate & Update Gene Expression
 # ------------------------------------------------
 
-def generate_initial_gene_expression(disease, stage):
-    """
-    Generate a new dictionary of gene expressions for a patient
-    given their 'disease' and 'stage' using the baseline ranges
-    and applying a stage multiplier.
+# Array form of DISEASE_GENE_BASE / STAGE_MULTIPLIERS for batched sampling.
+# GENE_RANGES is indexed [disease, gene, (min, max)], with diseases numbered
+# by DISEASE_TO_IDX (DIAGNOSIS order) and genes in GENE_LIST order; LOW/HIGH
+# are its min/max planes. STAGE_MULT is indexed by stage number (index 0 is unused).
+DISEASE_TO_IDX = {disease: i for i, disease in enumerate(DIAGNOSIS)}
+GENE_RANGES = np.array(
+    [[DISEASE_GENE_BASE[disease][gene] for gene in GENE_LIST] for disease in DISEASE_TO_IDX],
+    dtype=np.float32
+)
+LOW, HIGH = GENE_RANGES[..., 0], GENE_RANGES[..., 1]
+STAGE_MULT = np.array(
+    [1.0] + [STAGE_MULTIPLIERS[stage] for stage in range(1, 5)],
+    dtype=np.float32
+)
+
+def generate_gene_expression(rng, disease_idx, initial_stage, num_cycles, variation=2):
     """
-    gene_expression = {}
-    disease_bases = DISEASE_GENE_BASE.get(disease, DISEASE_GENE_BASE["Breast Cancer"])
-    stage_multiplier = STAGE_MULTIPLIERS.get(stage, 1.0)
-    
-    for gene_name in GENE_LIST:
-        base_range = disease_bases.get(gene_name, (5, 10))
-        val = random.uniform(base_range[0], base_range[1])
-        gene_expression[gene_name] = round(val * stage_multiplier, 2)
-    
-    return gene_expression
+    Generate the gene expression of every patient for every cycle in one batch.
 
-def update_gene_expression(old_expression, disease, stage, variation=2):
-    """
-    Update an existing expression dictionary to reflect stage progression
-    and random drift. The new stage multiplier is applied on top of the old value.
+    The first cycle is drawn from the disease's baseline range and scaled by
+    the stage multiplier; each later cycle drifts randomly from the previous
+    one and has the (progressed) stage multiplier applied on top.
+
+    Returns an array of shape (num_patients, num_cycles, len(GENE_LIST)),
+    rounded to 2 decimals; it is accumulated in float64 so the rounded values
+    stay exact.
     """
-    stage_multiplier = STAGE_MULTIPLIERS.get(stage, 1.0)
-    
-    new_expr = {}
-    for gene_name, old_val in old_expression.items():
-        drift = random.uniform(-variation, variation)
-        new_val = (old_val + drift) * stage_multiplier
-        new_expr[gene_name] = round(new_val, 2)
-    
-    return new_expr
+    u = rng.random((len(disease_idx), num_cycles, len(GENE_LIST)), dtype=np.float32)
+    stages = np.minimum(initial_stage[:, None] + np.arange(num_cycles), 4)
+    stage_mult = STAGE_MULT[stages][:, :, None]
+
+    expr = np.empty(u.shape)
+    if num_cycles == 0:
+        return expr
+
+    low = LOW[disease_idx]
+    expr[:, 0] = (low + (HIGH[disease_idx] - low) * u[:, 0]) * stage_mult[:, 0]
+
+    drift = (2 * u[:, 1:] - 1) * variation
+    for c in range(1, num_cycles):
+        expr[:, c] = (expr[:, c - 1] + drift[:, c - 1]) * stage_mult[:, c]
+
+    # Round once, after the whole trajectory has been accumulated
+    np.round(expr, 2, out=expr)
+    return expr
 
 # ------------------------------------------------
 # 3. Other Utility Functions
 # ------------------------------------------------
 
-def random_date(start_year=2021, end_year=2025):
-    start_dt = datetime(start_year, 1, 1)
-    end_dt = datetime(end_year, 12, 31)
-    delta = end_dt - start_dt
-    random_days = random.randrange(delta.days + 1)
-    return start_dt + timedelta(days=random_days)
-
-def generate_patient_name():
-    first_names = ["John", "Jane", "Mary", "Michael", "Sarah", "David", 
-                   "Anna", "Peter", "Linda", "James"]
-    last_names = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", 
-                  "Miller", "Davis", "Martinez", "Wilson"]
-    return f"{random.choice(first_names)} {random.choice(last_names)}"
-
-def generate_gender():
-    return random.choice(["Male", "Female", "Other"])
-
-def generate_diagnosis():
-    diagnoses = DIAGNOSIS
-    return random.choice(diagnoses)
-
-def generate_treatment_type():
-    treatments = TREATMENTS
-    return random.choice(treatments)
-
-def generate_ethnicity():
-    ethnicities = ETHNICITIES
-    return random.choice(ethnicities)
-
-def generate_us_location():
-    us_states = [
-        "AL","AK","AZ","AR","CA","CO","CT","DE","FL","GA","HI","ID","IL","IN","IA",
-        "KS","KY","LA","ME","MD","MA","MI","MN","MS","MO","MT","NE","NV","NH","NJ",
-        "NM","NY","NC","ND","OH","OK","OR","PA","RI","SC","SD","TN","TX","UT","VT",
-        "VA","WA","WV","WI","WY"
-    ]
-    return random.choice(us_states)
+# Dates are handled as integer day offsets from DATE_EPOCH and only turned
+# into "YYYY-MM-DD" strings when a table is built (see format_days).
+DATE_EPOCH = np.datetime64("2021-01-01", "D")
 
-def generate_treatment_history():
-    possible_treatments = TREATMENTS
-    num_treatments = random.randint(0, 3)
-    return random.sample(possible_treatments, num_treatments)
+def to_day(date):
+    """Day offset of a "YYYY-MM-DD" date (or datetime64) from DATE_EPOCH."""
+    return int((np.datetime64(date, "D") - DATE_EPOCH).astype(np.int64))
 
-def generate_adverse_events():
-    possible_events = ADVERSE_EVENTS
-    num_events = random.randint(0, 4)
-    return random.sample(possible_events, num_events)
+def random_days(rng, size, start_year=2021, end_year=2025):
+    """
+    Draw 'size' random dates between Jan 1 of start_year and Dec 31 of
+    end_year (inclusive), as int32 day offsets from DATE_EPOCH.
+    """
+    start_day = to_day(f"{start_year}-01-01")
+    end_day = to_day(f"{end_year}-12-31")
+    return rng.integers(start_day, end_day + 1, size=size, dtype=np.int32)
 
-def generate_comorbidities():
-    possible_comorbidities = COMORBIDITIES
-    num_co = random.randint(0, 3)
-    return random.sample(possible_comorbidities, num_co)
+def random_choices(rng, options, size):
+    """
+    Pick 'size' values uniformly from 'options' (with replacement),
+    returned as an object array.
+    """
+    options = np.array(options, dtype=object)
+    return options[rng.integers(0, len(options), size=size)]
 
-def generate_treatment_outcome():
+def random_samples(rng, options, size, max_k, min_k=0):
     """
-    Randomly assign a final treatment outcome for each cycle,
-    including the possibility of 'Discontinued'.
+    Draw 'size' samples of min_k..max_k distinct values from 'options'
+    (each without replacement), returned as a list of lists.
     """
-    # We add 'Discontinued' as a possible event with some probability.
-    # You can tune these probabilities as needed.
-    outcomes = OUTCOMES
-    return random.choice(outcomes)
+    options = np.array(options, dtype=object)
+    num_values = rng.integers(min_k, max_k + 1, size=size)
+    # A random permutation per sample; its first k entries are the sample
+    order = np.argsort(rng.random((size, len(options))), axis=1)
+    permuted = options[order].tolist()
+    return [row[:k] for row, k in zip(permuted, num_values.tolist())]
+
+def generate_patient_names(rng, size):
+    return random_choices(rng, FIRST_NAMES, size) + " " + random_choices(rng, LAST_NAMES, size)
+
+def generate_genders(rng, size):
+    return random_choices(rng, GENDERS, size)
+
+def generate_treatment_types(rng, size):
+    return random_choices(rng, TREATMENTS, size)
+
+def generate_ethnicities(rng, size):
+    return random_choices(rng, ETHNICITIES, size)
+
+def generate_us_locations(rng, size):
+    return random_choices(rng, US_STATES, size)
+
+def generate_treatment_histories(rng, size):
+    return random_samples(rng, TREATMENTS, size, max_k=3)
+
+def generate_adverse_events(rng, size):
+    return random_samples(rng, ADVERSE_EVENTS, size, max_k=4)
+
+def generate_comorbidities(rng, size):
+    return random_samples(rng, COMORBIDITIES, size, max_k=3)
 
+# DRUGS_BY_STAGE as a (stage - 1, drug) array (every stage offers the same
+# number of drugs), and every ordering of one stage's drugs.
+STAGE_DRUGS = np.array([DRUGS_BY_STAGE[stage] for stage in range(1, 5)], dtype=object)
+DRUG_PERMUTATIONS = np.array(list(itertools.permutations(range(STAGE_DRUGS.shape[1]))))
 
+def generate_cycle_drugs(rng, disease_stage):
+    """
+    Pick 1-3 distinct drugs for every cycle from its stage's DRUGS_BY_STAGE list.
 
-def generate_cycle_drugs_for_stage(disease_stage):
-    possible_drugs = DRUGS_BY_STAGE.get(disease_stage, [])
-    if not possible_drugs:
-        return []
-    num_drugs = random.randint(1, min(3, len(possible_drugs)))
-    return random.sample(possible_drugs, num_drugs)
+    Returns (drugs, num_drugs): drugs is a (num_cycles, 3) object array whose
+    first num_drugs[i] entries in row i are the drugs used in cycle i.
+    """
+    num_options = STAGE_DRUGS.shape[1]
+    num_drugs = rng.integers(1, min(3, num_options) + 1, size=len(disease_stage)).astype(np.int8)
+    # One random row of the permutation table per cycle orders its stage's drugs
+    order = DRUG_PERMUTATIONS[rng.integers(0, len(DRUG_PERMUTATIONS), size=len(disease_stage))]
+    drugs = STAGE_DRUGS[(disease_stage - 1)[:, None], order]
+    return drugs, num_drugs
 
 
 
@@ -246,331 +288,412 @@ def generate_cycle_drugs_for_stage(disease_stage):
 # 4. Generate Treatment Cycles
 # ------------------------------------------------
 
-def generate_treatment_cycles(disease, start_date, num_cycles=4, cycle_gap_days=21, date_of_death=None):
+def generate_treatment_cycles(rng, disease_idx, start_days, num_cycles, cycle_gap_days=21):
     """
-    Generate a list of dictionaries for each cycle:
+    Generate the treatment cycles of all patients at once. Patient i gets up to
+    num_cycles[i] cycles, cycle_gap_days apart, starting on day start_days[i]:
         - cycle_number
-        - cycle_date
-        - disease_stage (1->4, only progresses)
-        - therapy_segment
-        - drugs_used
-        - gene_expression (tailored to disease & stage)
-        - treatment_outcome
-        - Discontinuation case: if outcome == 'Discontinued', we stop generating new cycles.
-
-    If date_of_death is provided, we end if the next cycle date >= date_of_death
-    or if outcome is 'Death'.
-    """
-    cycles = []
-    # Start disease stage at 1 or 2
-    disease_stage = random.randint(1, 2)
-    gene_expression = generate_initial_gene_expression(disease, disease_stage)
-
-    for cycle_num in range(1, num_cycles + 1):
-        # Check if the patient has died (date_of_death) before starting this cycle
-        if date_of_death and start_date >= date_of_death:
-            break
-        
-        outcome = generate_treatment_outcome()
-        
-        cycle_info = {
-            "cycle_number": cycle_num,
-            "cycle_date": start_date.strftime("%Y-%m-%d"),
-            "disease_stage": disease_stage,
-            "therapy_segment": THERAPY_SEGMENT_BY_STAGE[disease_stage],
-            "drugs_used": generate_cycle_drugs_for_stage(disease_stage),
-            "gene_expression": gene_expression,
-            "treatment_outcome": outcome
-        }
-        cycles.append(cycle_info)
-        
-        # Advance the date for the next cycle (if any)
-        start_date += timedelta(days=cycle_gap_days)
-        
-        # Update gene expression for next cycle
-        next_stage = min(disease_stage + 1, 4)
-        gene_expression = update_gene_expression(gene_expression, disease, next_stage)
-        
-        # Increase disease_stage if not already 4
-        if disease_stage < 4:
-            disease_stage += 1
-        
-        # If outcome is Death -> no further cycles
-        if outcome == "Death":
-            date_of_death = start_date
-            break
-        
-        # If outcome is Discontinued -> no further cycles, but patient is still alive
-        if outcome == "Discontinued":
-            # We won't set date_of_death, but we stop generating cycles anyway
-            break
-
-    return cycles, date_of_death
+        - cycle_day (day offset from DATE_EPOCH)
+        - disease_stage (starts at 1 or 2 and only progresses, up to 4)
+        - drugs_used / num_drugs (see generate_cycle_drugs)
+        - gene_expression (tailored to disease & stage), one row of
+          len(GENE_LIST) values per cycle
+        - outcome_code (index into OUTCOMES)
+        - Discontinuation case: if outcome == 'Discontinued', no further cycles.
+
+    If the outcome is 'Death', no further cycles are generated and the patient's
+    date_of_death is the date the next cycle would have had.
+
+    Returns (cycles, number_of_cycles, date_of_death). 'cycles' is a dict of
+    arrays with one entry per cycle that took place, ordered by patient and
+    then cycle number; its 'patient_idx' maps each cycle back to its patient.
+    Apart from drugs_used, all cycle fields are fixed-width numeric arrays;
+    labels such as therapy_segment are only attached by the table builders.
+    """
+    num_patients = len(disease_idx)
+    max_cycles = int(num_cycles.max(initial=0))
+    offsets = np.arange(max_cycles)
+
+    # Every planned cycle is drawn up front, then masked by the stopping rules.
+    # You can tune the outcome probabilities as needed (currently uniform).
+    initial_stage = rng.integers(1, 3, size=num_patients)
+    stages = np.minimum(initial_stage[:, None] + offsets, 4)
+    outcome_idx = rng.integers(0, len(OUTCOMES), size=(num_patients, max_cycles))
+    gene_expression = generate_gene_expression(rng, disease_idx, initial_stage, max_cycles)
+
+    died = outcome_idx == OUTCOMES.index("Death")
+    stops = died | (outcome_idx == OUTCOMES.index("Discontinued"))
+    stopped_before = (np.cumsum(stops, axis=1) - stops) > 0
+    valid = (offsets < num_cycles[:, None]) & ~stopped_before
+
+    cycle_days = start_days[:, None] + (offsets * cycle_gap_days).astype(np.int32)
+
+    # 'Death' can only be a patient's last cycle
+    number_of_cycles = valid.sum(axis=1)
+    date_of_death = np.where(
+        (died & valid).any(axis=1),
+        DATE_EPOCH + (start_days + number_of_cycles * cycle_gap_days),
+        np.datetime64("NaT")
+    )
+
+    patient_idx, cycle_idx = np.nonzero(valid)
+    disease_stage = stages[patient_idx, cycle_idx].astype(np.int8)
+    drugs_used, num_drugs = generate_cycle_drugs(rng, disease_stage)
+
+    cycles = {
+        "patient_idx":     patient_idx,
+        "cycle_number":    (cycle_idx + 1).astype(np.int16),
+        "cycle_day":       cycle_days[patient_idx, cycle_idx],
+        "disease_stage":   disease_stage,
+        "drugs_used":      drugs_used,
+        "num_drugs":       num_drugs,
+        "gene_expression": gene_expression[patient_idx, cycle_idx],
+        "outcome_code":    outcome_idx[patient_idx, cycle_idx].astype(np.int8)
+    }
+    return cycles, number_of_cycles, date_of_death
 
 # ------------------------------------------------
 # 5. Main Patient Generation
 # ------------------------------------------------
 
-def generate_patient_info(num_patients=5):
+def generate_patient_info(num_patients=5, rng=None):
     """
-    Generate a list of patient dictionaries. For each patient:
-      - Basic demographics & diagnosis
-      - Possibly truncated cycles if 'Death' or 'Discontinued' occurs
-      - OS/PFS
-      - Disease- & stage-specific gene expression
+    Generate the patient data as a struct of arrays:
+      - "patients": one entry per patient with basic demographics & diagnosis,
+        OS/PFS, date_of_death and number_of_cycles
+      - "cycles": one entry per cycle, possibly truncated if 'Death' or
+        'Discontinued' occurs, with disease- & stage-specific gene expression
+        (see generate_treatment_cycles)
+
+    Draws from the module-level generator unless 'rng' is given.
     """
-    patients_data = []
-    
-    for i in range(1, num_patients + 1):
-        patient_id = f"PT{i:03d}"
-        name = generate_patient_name()
-        age = random.randint(25, 85)
-        gender = generate_gender()
-        diagnosis = generate_diagnosis()
-        treatment_type = generate_treatment_type()
-        
-        ethnicity = generate_ethnicity()
-        location = generate_us_location()
-        treatment_history = generate_treatment_history()
-        adverse_events = generate_adverse_events()
-        comorbidities = generate_comorbidities()
-        number_of_hospitalizations = random.randint(0, 3)
-        
-        os_months = random.randint(6, 60)
-        pfs_months = random.randint(3, min(os_months - 1, 24))
-        
-        first_cycle_date = random_date(2021, 2024)
-        planned_cycles = random.randint(3, 6)
-        
-        # Generate cycles
-        cycle_data, date_of_death = generate_treatment_cycles(
-            disease=diagnosis,
-            start_date=first_cycle_date,
-            num_cycles=planned_cycles,
-            cycle_gap_days=21
-        )
-        
-        actual_cycle_count = len(cycle_data)
-        
-        patient_dict = {
-            "patient_id": patient_id,
-            "name": name,
-            "age": age,
-            "gender": gender,
-            "ethnicity": ethnicity,
-            "location": location,
-            "diagnosis": diagnosis,
-            "treatment_type": treatment_type,
-            "treatment_history": treatment_history,
-            "adverse_events": adverse_events,
-            "comorbidities": comorbidities,
-            "number_of_hospitalizations": number_of_hospitalizations,
-            "os_months": os_months,
-            "pfs_months": pfs_months,
-            "date_of_death": date_of_death,
-            "number_of_cycles": actual_cycle_count,
-            "cycles": cycle_data
-        }
-        patients_data.append(patient_dict)
-    
-    return patients_data
+    if rng is None:
+        rng = _RNG
+
+    disease_idx = rng.integers(0, len(DIAGNOSIS), size=num_patients)
+
+    os_months = rng.integers(6, 61, size=num_patients)
+    pfs_months = rng.integers(3, np.minimum(os_months - 1, 24) + 1)
+
+    first_cycle_days = random_days(rng, num_patients, 2021, 2024)
+    planned_cycles = rng.integers(3, 7, size=num_patients)
+
+    cycles, number_of_cycles, date_of_death = generate_treatment_cycles(
+        rng,
+        disease_idx=disease_idx,
+        start_days=first_cycle_days,
+        num_cycles=planned_cycles,
+        cycle_gap_days=21
+    )
+
+    patients = {
+        "patient_id": np.array([f"PT{i:03d}" for i in range(1, num_patients + 1)], dtype=object),
+        "name": generate_patient_names(rng, num_patients),
+        "age": rng.integers(25, 86, size=num_patients),
+        "gender": generate_genders(rng, num_patients),
+        "ethnicity": generate_ethnicities(rng, num_patients),
+        "location": generate_us_locations(rng, num_patients),
+        "disease_idx": disease_idx,
+        "diagnosis": np.array(DIAGNOSIS, dtype=object)[disease_idx],
+        "treatment_type": generate_treatment_types(rng, num_patients),
+        "treatment_history": generate_treatment_histories(rng, num_patients),
+        "adverse_events": generate_adverse_events(rng, num_patients),
+        "comorbidities": generate_comorbidities(rng, num_patients),
+        "number_of_hospitalizations": rng.integers(0, 4, size=num_patients),
+        "os_months": os_months,
+        "pfs_months": pfs_months,
+        "date_of_death": date_of_death,
+        "number_of_cycles": number_of_cycles
+    }
+
+    return {"patients": patients, "cycles": cycles}
 
 # ------------------------------------------------
 # 6. DataFrame Constructors
 # ------------------------------------------------
 
-def create_rwe_table(patients_data):
+# Categorical dtypes for the repeated string columns; the integer codes
+# produced by generate_treatment_cycles map straight onto their categories.
+DIAGNOSIS_DTYPE = pd.CategoricalDtype(DIAGNOSIS)
+TREATMENT_DTYPE = pd.CategoricalDtype(TREATMENTS)
+ETHNICITY_DTYPE = pd.CategoricalDtype(ETHNICITIES)
+GENDER_DTYPE = pd.CategoricalDtype(GENDERS)
+LOCATION_DTYPE = pd.CategoricalDtype(US_STATES)
+OUTCOME_DTYPE = pd.CategoricalDtype(OUTCOMES)
+FINAL_OUTCOME_DTYPE = pd.CategoricalDtype(OUTCOMES + ["No Treatment"])
+THERAPY_SEGMENT_DTYPE = pd.CategoricalDtype(
+    [THERAPY_SEGMENT_BY_STAGE[stage] for stage in range(1, 5)]
+)
+DRUG_DTYPE = pd.CategoricalDtype(
+    [drug for stage in range(1, 5) for drug in DRUGS_BY_STAGE[stage]]
+)
+
+# "YYYY-MM-DD" string for every day from DATE_EPOCH on, so that formatting a
+# date column is an array lookup that reuses the same string objects.
+DATE_STR = np.datetime_as_string(DATE_EPOCH + np.arange(6 * 365), unit="D").astype(object)
+
+def format_days(days):
+    """Format an array of day offsets from DATE_EPOCH as "YYYY-MM-DD" strings."""
+    if len(days) and (days.min() < 0 or days.max() >= len(DATE_STR)):
+        # Outside the precomputed range
+        return np.datetime_as_string(DATE_EPOCH + days, unit="D").astype(object)
+    return DATE_STR[days]
+
+def join_values(values):
+    """
+    Join each list in 'values' into a comma-separated string, written
+    straight into a preallocated object array of len(values).
+    """
+    return np.fromiter(map(", ".join, values), dtype=object, count=len(values))
+
+def demographic_columns(patients):
+    """
+    Patient-level demographic/clinical columns shared by the EHR and registry
+    tables, with list fields joined into comma-separated strings.
+    """
+    return {
+        "patient_id":     patients["patient_id"],
+        "name":           patients["name"],
+        "age":            patients["age"].astype(np.int16),
+        "gender":         pd.Categorical(patients["gender"], dtype=GENDER_DTYPE),
+        "ethnicity":      pd.Categorical(patients["ethnicity"], dtype=ETHNICITY_DTYPE),
+        "location":       pd.Categorical(patients["location"], dtype=LOCATION_DTYPE),
+        "diagnosis":      pd.Categorical.from_codes(patients["disease_idx"], dtype=DIAGNOSIS_DTYPE),
+        "treatment_type": pd.Categorical(patients["treatment_type"], dtype=TREATMENT_DTYPE),
+        "treatment_history": join_values(patients["treatment_history"]),
+        "adverse_events":    join_values(patients["adverse_events"]),
+        "comorbidities":     join_values(patients["comorbidities"]),
+        "number_of_hospitalizations": patients["number_of_hospitalizations"].astype(np.int8)
+    }
+
+def build_patient_frame(patients_data):
+    """
+    Patient Table (1 row per patient) of the demographic columns that the
+    EHR and registry tables share, so the list fields are only joined once.
+    """
+    return pd.DataFrame(demographic_columns(patients_data["patients"]))
+
+def join_cycle_drugs(cycles):
+    """Comma-separated string of the drugs used in every cycle."""
+    join = ", ".join
+    num_drugs = cycles["num_drugs"].tolist()
+    return np.fromiter(
+        (join(drugs[:k]) for drugs, k in zip(cycles["drugs_used"].tolist(), num_drugs)),
+        dtype=object,
+        count=len(num_drugs)
+    )
+
+def build_cycle_frame(patients_data):
+    """
+    Cycle Table (wide format, 1 row per patient/cycle) that the RWE, TCGA,
+    EHR and claims tables are derived from:
+      - patient_id, cycle_number, cycle_date, disease_stage, therapy_segment,
+        treatment_outcome
+      - drugs in a single comma-separated column (drugs_used)
+      - Columns for each gene in GENE_LIST.
+    """
+    patients, cycles = patients_data["patients"], patients_data["cycles"]
+    gene_expression = cycles["gene_expression"]
+
+    frame = pd.DataFrame({
+        "patient_id":     patients["patient_id"][cycles["patient_idx"]],
+        "cycle_number":   cycles["cycle_number"],
+        "cycle_date":     format_days(cycles["cycle_day"]),
+        "disease_stage":  cycles["disease_stage"],
+        "therapy_segment":pd.Categorical.from_codes(
+            cycles["disease_stage"] - 1, dtype=THERAPY_SEGMENT_DTYPE
+        ),
+        "treatment_outcome": pd.Categorical.from_codes(
+            cycles["outcome_code"], dtype=OUTCOME_DTYPE
+        ),
+        "drugs_used":     join_cycle_drugs(cycles)
+    })
+    # The (num_cycles, len(GENE_LIST)) gene rows become one float block,
+    # named after GENE_LIST, instead of being split into separate columns
+    genes = pd.DataFrame(gene_expression, columns=GENE_LIST, copy=False)
+    return pd.concat([frame, genes], axis=1)
+
+def create_rwe_table(patients_data, cycle_frame=None):
     """
     RWE Table (wide format for genes):
       - One row per (patient_id, cycle_number, cycle_date, drug_name)
       - Columns for each gene in GENE_LIST (EGFR, KRAS, BRAF, PIK3CA).
     """
-    rwe_rows = []
-    for patient in patients_data:
-        for cycle in patient["cycles"]:
-            for drug in cycle["drugs_used"]:
-                row = {
-                    "patient_id":     patient["patient_id"],
-                    "cycle_number":   cycle["cycle_number"],
-                    "cycle_date":     cycle["cycle_date"],
-                    "drug_name":      drug,
-                    "disease_stage":  cycle["disease_stage"],
-                    "therapy_segment":cycle["therapy_segment"],
-                    "treatment_outcome": cycle["treatment_outcome"]
-                }
-                # Flatten each gene expression into its own columns
-                for gene_name, expr_value in cycle["gene_expression"].items():
-                    row[gene_name] = expr_value
-
-                rwe_rows.append(row)
-    return pd.DataFrame(rwe_rows)
-
-def create_tcga_table(patients_data):
+    if cycle_frame is None:
+        cycle_frame = build_cycle_frame(patients_data)
+    cycles = patients_data["cycles"]
+    drugs_used, num_drugs = cycles["drugs_used"], cycles["num_drugs"]
+
+    # Repeat each cycle once per drug used in it
+    row_cycle = np.repeat(np.arange(len(num_drugs)), num_drugs)
+    used = np.arange(drugs_used.shape[1]) < num_drugs[:, None]
+
+    rwe_df = cycle_frame.take(row_cycle).reset_index(drop=True)
+    rwe_df["drug_name"] = pd.Categorical(drugs_used[used], dtype=DRUG_DTYPE)
+    return rwe_df[[
+        "patient_id", "cycle_number", "cycle_date", "drug_name", "disease_stage",
+        "therapy_segment", "treatment_outcome", *GENE_LIST
+    ]]
+
+def create_tcga_table(patients_data, cycle_frame=None):
     """
     TCGA Table (wide format, 1 row per patient/cycle).
     """
-    tcga_rows = []
-    for patient in patients_data:
-        for cycle in patient["cycles"]:
-            row_dict = {
-                "patient_id": patient["patient_id"],
-                "cycle_number": cycle["cycle_number"],
-                "cycle_date": cycle["cycle_date"]
-            }
-            for gene_name, expr_value in cycle["gene_expression"].items():
-                row_dict[gene_name] = expr_value
-            tcga_rows.append(row_dict)
-    return pd.DataFrame(tcga_rows)
-
-def create_ehr_table(patients_data):
+    if cycle_frame is None:
+        cycle_frame = build_cycle_frame(patients_data)
+    return cycle_frame[["patient_id", "cycle_number", "cycle_date", *GENE_LIST]]
+
+def create_ehr_table(patients_data, cycle_frame=None, patient_frame=None):
     """
     EHR Table:
       - One row per patient/cycle
       - Includes demographic/clinical data, disease_stage, therapy_segment,
         plus drugs in a single comma-separated column.
     """
-    ehr_rows = []
-    for patient in patients_data:
-        adverse_events_str = ", ".join(patient["adverse_events"])
-        treatment_history_str = ", ".join(patient["treatment_history"])
-        comorbidities_str = ", ".join(patient["comorbidities"])
-        
-        for cycle in patient["cycles"]:
-            drug_string = ", ".join(cycle["drugs_used"])
-            ehr_rows.append({
-                "patient_id":    patient["patient_id"],
-                "name":          patient["name"],
-                "age":           patient["age"],
-                "gender":        patient["gender"],
-                "ethnicity":     patient["ethnicity"],
-                "location":      patient["location"],
-                "diagnosis":     patient["diagnosis"],
-                "treatment_type":patient["treatment_type"],
-                "treatment_history":      treatment_history_str,
-                "adverse_events":         adverse_events_str,
-                "comorbidities":          comorbidities_str,
-                "number_of_hospitalizations": patient["number_of_hospitalizations"],
-                "date_of_death": patient["date_of_death"],
-                "cycle_number": cycle["cycle_number"],
-                "cycle_date":   cycle["cycle_date"],
-                "disease_stage":cycle["disease_stage"],
-                "therapy_segment": cycle["therapy_segment"],
-                "treatment_outcome": cycle["treatment_outcome"],
-                "drugs_used":    drug_string
-            })
-    return pd.DataFrame(ehr_rows)
-
-def create_patient_registry_table(patients_data):
+    if cycle_frame is None:
+        cycle_frame = build_cycle_frame(patients_data)
+    if patient_frame is None:
+        patient_frame = build_patient_frame(patients_data)
+    patients, cycles = patients_data["patients"], patients_data["cycles"]
+
+    # Patient columns are built once per patient, then repeated per cycle
+    patient_idx = cycles["patient_idx"]
+    ehr_df = patient_frame.take(patient_idx).reset_index(drop=True)
+    ehr_df["date_of_death"] = patients["date_of_death"][patient_idx].astype("datetime64[ns]")
+
+    return pd.concat([
+        ehr_df,
+        cycle_frame[[
+            "cycle_number", "cycle_date", "disease_stage",
+            "therapy_segment", "treatment_outcome", "drugs_used"
+        ]]
+    ], axis=1)
+
+def create_patient_registry_table(patients_data, cycle_frame=None, patient_frame=None):
     """
     Patient Registry Table:
       - One row per patient
     """
-    registry_rows = []
-    for patient in patients_data:
-        cycle_dates = [c["cycle_date"] for c in patient["cycles"]]
-        cycle_dates_sorted = sorted(cycle_dates)
-        
-        final_outcome = "No Treatment"
-        if patient["cycles"]:
-            final_outcome = patient["cycles"][-1]["treatment_outcome"]
-        
-        first_cycle = cycle_dates_sorted[0] if cycle_dates_sorted else None
-        last_cycle = cycle_dates_sorted[-1] if cycle_dates_sorted else None
-        
-        adverse_events_str = ", ".join(patient["adverse_events"])
-        treatment_history_str = ", ".join(patient["treatment_history"])
-        comorbidities_str = ", ".join(patient["comorbidities"])
-        
-        registry_rows.append({
-            "patient_id":     patient["patient_id"],
-            "name":           patient["name"],
-            "age":            patient["age"],
-            "gender":         patient["gender"],
-            "ethnicity":      patient["ethnicity"],
-            "location":       patient["location"],
-            "diagnosis":      patient["diagnosis"],
-            "treatment_type": patient["treatment_type"],
-            "treatment_history": treatment_history_str,
-            "adverse_events":    adverse_events_str,
-            "comorbidities":     comorbidities_str,
-            "number_of_hospitalizations": patient["number_of_hospitalizations"],
-            "final_outcome":   final_outcome,
-            "date_of_death":   patient["date_of_death"],
-            "number_of_cycles":patient["number_of_cycles"],
-            "first_cycle_date": first_cycle,
-            "last_cycle_date":  last_cycle,
-            "os_months":       patient["os_months"],
-            "pfs_months":      patient["pfs_months"]
-        })
-    return pd.DataFrame(registry_rows)
-
-def create_claims_table(patients_data):
+    if cycle_frame is None:
+        cycle_frame = build_cycle_frame(patients_data)
+    if patient_frame is None:
+        patient_frame = build_patient_frame(patients_data)
+    patients = patients_data["patients"]
+    number_of_cycles = patients["number_of_cycles"]
+
+    # Cycles are stored patient by patient in date order, so each patient's
+    # first/last cycle sit at the ends of its contiguous block.
+    treated = number_of_cycles > 0
+    last = np.cumsum(number_of_cycles) - 1
+    first = last - number_of_cycles + 1
+
+    cycle_dates = cycle_frame["cycle_date"].to_numpy()
+    # Patients without any cycle get the extra "No Treatment" category
+    outcome_codes = np.full(len(number_of_cycles), len(OUTCOMES), dtype=np.int8)
+    outcome_codes[treated] = cycle_frame["treatment_outcome"].cat.codes.to_numpy()[last[treated]]
+    final_outcome = pd.Categorical.from_codes(outcome_codes, dtype=FINAL_OUTCOME_DTYPE)
+    first_cycle_date = np.full(len(number_of_cycles), None, dtype=object)
+    first_cycle_date[treated] = cycle_dates[first[treated]]
+    last_cycle_date = np.full(len(number_of_cycles), None, dtype=object)
+    last_cycle_date[treated] = cycle_dates[last[treated]]
+
+    return patient_frame.assign(**{
+        "final_outcome":   final_outcome,
+        "date_of_death":   patients["date_of_death"].astype("datetime64[ns]"),
+        "number_of_cycles":number_of_cycles.astype(np.int8),
+        "first_cycle_date": first_cycle_date,
+        "last_cycle_date":  last_cycle_date,
+        "os_months":       patients["os_months"].astype(np.int16),
+        "pfs_months":      patients["pfs_months"].astype(np.int16)
+    })
+
+def create_claims_table(patients_data, cycle_frame=None, rng=None):
     """
     Claims Table:
       - One row per patient/cycle
       - Columns for cost_of_treatment, cost_of_diagnostics, etc.
     """
-    procedure_codes = ["CPT-1234", "CPT-5678", "CPT-9012", "CPT-3456"]
-    claims_rows = []
-    claim_id_counter = 1000
-    
-    for patient in patients_data:
-        for cycle in patient["cycles"]:
-            proc_code = random.choice(procedure_codes)
-            drug_string = ", ".join(cycle["drugs_used"])
-            
-            cost_of_treatment = round(random.uniform(500, 5000), 2)
-            cost_of_diagnostics = round(random.uniform(200, 2000), 2)
-            
-            total_bill = round(cost_of_treatment + cost_of_diagnostics, 2)
-            coverage_fraction = random.uniform(0.5, 0.9)
-            paid_by_insurance = round(total_bill * coverage_fraction, 2)
-            paid_by_patient = round(total_bill - paid_by_insurance, 2)
-            
-            claims_rows.append({
-                "claim_id": claim_id_counter,
-                "patient_id": patient["patient_id"],
-                "date_of_service": cycle["cycle_date"],
-                "drugs_administered": drug_string,
-                "procedure_code": proc_code,
-                "cost_of_treatment": cost_of_treatment,
-                "cost_of_diagnostics": cost_of_diagnostics,
-                "total_bill": total_bill,
-                "paid_by_insurance": paid_by_insurance,
-                "paid_by_patient": paid_by_patient
-            })
-            
-            claim_id_counter += 1
-    
-    return pd.DataFrame(claims_rows)
+    if cycle_frame is None:
+        cycle_frame = build_cycle_frame(patients_data)
+    procedure_codes = np.array(PROCEDURE_CODES, dtype=object)
+    claim_id_start = 1000
+
+    num_claims = len(cycle_frame)
+    if rng is None:
+        rng = _RNG
+
+    cost_of_treatment = np.round(rng.uniform(500, 5000, size=num_claims), 2)
+    cost_of_diagnostics = np.round(rng.uniform(200, 2000, size=num_claims), 2)
+
+    total_bill = np.round(cost_of_treatment + cost_of_diagnostics, 2)
+    coverage_fraction = rng.uniform(0.5, 0.9, size=num_claims)
+    paid_by_insurance = np.round(total_bill * coverage_fraction, 2)
+    paid_by_patient = np.round(total_bill - paid_by_insurance, 2)
+
+    return pd.DataFrame({
+        "claim_id": np.arange(claim_id_start, claim_id_start + num_claims),
+        "patient_id": cycle_frame["patient_id"].to_numpy(),
+        "date_of_service": cycle_frame["cycle_date"].to_numpy(),
+        "drugs_administered": cycle_frame["drugs_used"].to_numpy(),
+        "procedure_code": procedure_codes[rng.integers(0, len(procedure_codes), size=num_claims)],
+        "cost_of_treatment": cost_of_treatment,
+        "cost_of_diagnostics": cost_of_diagnostics,
+        "total_bill": total_bill,
+        "paid_by_insurance": paid_by_insurance,
+        "paid_by_patient": paid_by_patient
+    })
 
 # ------------------------------------------------
 # 7. High-Level "Run" Function
 # ------------------------------------------------
 
-def generate_all_tables(num_patients=5):
+def generate_all_tables(num_patients=5, seed=None):
     """
     Generates all the synthetic data tables (RWE, TCGA, EHR, Registry, Claims)
     for the specified number of patients, and returns them as DataFrames.
+    A seed makes the tables reproducible; without one the module-level
+    generator is used.
     
     Example usage:
         rwe_df, tcga_df, ehr_df, registry_df, claims_df = generate_all_tables(10)
     """
-    patients_data = generate_patient_info(num_patients)
+    rng = _RNG if seed is None else np.random.default_rng(seed)
+    patients_data = generate_patient_info(num_patients, rng)
+    # Shared by the tables below, so cycles and patients are only tabulated once
+    cycle_frame = build_cycle_frame(patients_data)
+    patient_frame = build_patient_frame(patients_data)
     
-    rwe_df       = create_rwe_table(patients_data)
-    tcga_df      = create_tcga_table(patients_data)
-    ehr_df       = create_ehr_table(patients_data)
-    registry_df  = create_patient_registry_table(patients_data)
-    claims_df    = create_claims_table(patients_data)
+    rwe_df       = create_rwe_table(patients_data, cycle_frame)
+    tcga_df      = create_tcga_table(patients_data, cycle_frame)
+    ehr_df       = create_ehr_table(patients_data, cycle_frame, patient_frame)
+    registry_df  = create_patient_registry_table(patients_data, cycle_frame, patient_frame)
+    claims_df    = create_claims_table(patients_data, cycle_frame, rng)
     
     return rwe_df, tcga_df, ehr_df, registry_df, claims_df
 
+# ------------------------------------------------
+# 8. Example Tables
+# ------------------------------------------------
+
+EXAMPLE_TABLES = ("df_rwe", "df_tcga", "df_ehr", "df_registry", "df_claims")
+
+def __getattr__(name):
+    """
+    Build the 600-patient example tables (df_rwe, df_tcga, ...) on first
+    access instead of at import; they are cached as module globals.
+    """
+    if name in EXAMPLE_TABLES:
+        tables = dict(zip(EXAMPLE_TABLES, generate_all_tables(num_patients=600)))
+        globals().update(tables)
+        return tables[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-df_rwe, df_tcga, df_ehr, df_registry, df_claims = generate_all_tables(num_patients=600)
+if __name__ == "__main__":
+    df_rwe, df_tcga, df_ehr, df_registry, df_claims = generate_all_tables(num_patients=600)
 
-print(df_rwe.head())
-print(df_tcga.head())
-print(df_ehr.head())
-print(df_registry.head())
-print(df_claims.head())
\ No newline at end of file
+    print(df_rwe.head())
+    print(df_tcga.head())
+    print(df_ehr.head())
+    print(df_registry.head())
+    print(df_claims.head())
\ No newline at end of file
@@ -1,7 +1,8 @@
+import numpy as np
 import pandas as pd
-import random, math
-from datetime import datetime
-from dateutil.relativedelta import relativedelta
+
+# Used by generate_competitor_sales_data_scurve_with_decline when no seed is given
+_RNG = np.random.default_rng()
 
 # Provided data
 CANCER_TYPES = [
@@ -28,27 +29,45 @@ def two_phase_curve(t, peak_month, L, k_grow, k_decay):
     - For t < peak_month: logistic growth from near 0 to ~L by the peak.
     - For t >= peak_month: exponential decay from ~L down toward 0.
 
+    All arguments may be NumPy arrays and are broadcast against each other,
+    so a whole (competitor, month) grid can be evaluated in one call.
+    Returns an array of the broadcast shape, or a float if all arguments
+    are scalars.
+
     Parameters
     ----------
-    t           : int (month index, e.g. 0..N-1)
-    peak_month  : int (the month index at which sales reach ~peak)
-    L           : float (peak sales level)
-    k_grow      : float (growth rate for logistic up)
-    k_decay     : float (exponential decay rate after peak)
+    t           : int or array (month index, e.g. 0..N-1)
+    peak_month  : int or array (the month index at which sales reach ~peak)
+    L           : float or array (peak sales level)
+    k_grow      : float or array (growth rate for logistic up)
+    k_decay     : float or array (exponential decay rate after peak)
     """
-    if t < peak_month:
-        # Logistic growth up to L by peak_month
-        # We'll set a logistic midpoint at half of peak_month so we get near L by t=peak_month
-        x0 = peak_month / 2.0
-        return L / (1.0 + math.exp(-k_grow*(t - x0)))
-    else:
-        # Exponential decay from L at t=peak_month onward
-        tprime = t - peak_month
-        return L * math.exp(-k_decay * tprime)
+    t = np.asarray(t, dtype=np.float64)
+    shape = np.broadcast_shapes(
+        np.shape(t), np.shape(peak_month), np.shape(L), np.shape(k_grow), np.shape(k_decay)
+    )
+    growing = np.broadcast_to(t < peak_month, shape)
+    # Logistic growth up to L by peak_month
+    # We'll set a logistic midpoint at half of peak_month so we get near L by t=peak_month
+    x0 = peak_month / 2.0
+    # Each point only needs the exponent of its own phase, so both phases
+    # share one array (of the full broadcast shape) and one exp, and are
+    # finished in place.
+    curve = np.broadcast_to(
+        np.where(growing, -k_grow*(t - x0), -k_decay*(t - peak_month)), shape
+    ).copy()
+    np.exp(curve, out=curve)
+    # Growth: L / (1 + exp(...))
+    np.add(curve, 1.0, out=curve, where=growing)
+    np.divide(L, curve, out=curve, where=growing)
+    # Exponential decay from L at t=peak_month onward: L * exp(...)
+    np.multiply(L, curve, out=curve, where=~growing)
+    return curve.item() if curve.ndim == 0 else curve
 
 def generate_competitor_sales_data_scurve_with_decline(
     start_month="2023-01",
-    end_month="2023-12"
+    end_month="2023-12",
+    seed=None
 ):
     """
     Generate monthly competitor sales data for each 
@@ -62,76 +81,82 @@ def generate_competitor_sales_data_scurve_with_decline(
       - stage
       - drug
       - sales
+
+    A seed makes the data reproducible; without one the module-level
+    generator is used.
     """
+    rng = _RNG if seed is None else np.random.default_rng(seed)
 
-    # Parse start/end into datetime objects
-    start_date = datetime.strptime(start_month, "%Y-%m")
-    end_date   = datetime.strptime(end_month,   "%Y-%m")
-    
-    # Build list of months in [start_date, end_date]
-    months = []
-    current_date = start_date
-    while current_date <= end_date:
-        months.append(current_date)
-        current_date += relativedelta(months=1)
+    # Build the months in [start_month, end_month] and their "YYYY-MM" labels
+    months = np.arange(
+        np.datetime64(start_month, "M"),
+        np.datetime64(end_month, "M") + 1
+    )
     
     num_months = len(months)
+    month_strs = np.datetime_as_string(months, unit="M").astype(object)
+
+    # (stage, drug) pairs flattened into a single axis
+    stage_drugs = [(stage, drug) for stage, drug_list in DRUGS_BY_STAGE.items() for drug in drug_list]
+    num_comp, num_ctype, num_stage_drug = len(COMPETITORS), len(CANCER_TYPES), len(stage_drugs)
 
     # For each competitor, define random parameters for the 2-phase curve:
     # - peak_month  (somewhere between 30%..70% of the total months)
     # - L          (peak sales, e.g. 3000..15000)
     # - k_grow     (growth rate, e.g. 0.2..1.0)
     # - k_decay    (decay rate, e.g. 0.05..0.3)
-    competitor_params = {}
-    for comp in COMPETITORS:
-        peak_m   = random.randint(int(num_months*0.3), int(num_months*0.7))
-        L        = random.uniform(3000, 15000) 
-        k_grow   = random.uniform(0.2, 1.0)
-        k_decay  = random.uniform(0.05, 0.3)
-        competitor_params[comp] = (peak_m, L, k_grow, k_decay)
-
-    rows = []
-    for month_idx, dt in enumerate(months):
-        month_str = dt.strftime("%Y-%m")
-        for comp in COMPETITORS:
-            # Evaluate base curve for competitor at this month
-            peak_m, L, k_grow, k_decay = competitor_params[comp]
-            base_value = two_phase_curve(
-                t=month_idx,
-                peak_month=peak_m,
-                L=L,
-                k_grow=k_grow,
-                k_decay=k_decay
-            )
-            
-            # Now for each (cancer_type, stage, drug)
-            for ctype in CANCER_TYPES:
-                for stage, drug_list in DRUGS_BY_STAGE.items():
-                    for drug in drug_list:
-                        # Variation factor so not all (ctype,stage,drug) are identical
-                        var_factor = random.uniform(0.8, 1.2)
-                        sales = base_value * var_factor
-
-                        # Add random noise (± 5%)
-                        noise = random.uniform(-0.05, 0.05) * sales
-                        sales += noise
-                        # Ensure no negative
-                        if sales < 0:
-                            sales = 0
-                        
-                        sales = int(round(sales))
-
-                        row = {
-                            "month": month_str,
-                            "competitor": comp,
-                            "cancer_type": ctype,
-                            "stage": stage,
-                            "drug": drug,
-                            "sales": sales
-                        }
-                        rows.append(row)
-    
-    df = pd.DataFrame(rows)
+    peak_m   = rng.integers(int(num_months*0.3), int(num_months*0.7) + 1, size=num_comp)
+    L        = rng.uniform(3000, 15000, size=num_comp)
+    k_grow   = rng.uniform(0.2, 1.0, size=num_comp)
+    k_decay  = rng.uniform(0.05, 0.3, size=num_comp)
+
+    # Base curve for every (month, competitor)
+    base_value = two_phase_curve(
+        t=np.arange(num_months)[:, None],
+        peak_month=peak_m,
+        L=L,
+        k_grow=k_grow,
+        k_decay=k_decay
+    )
+
+    # Now for each (cancer_type, stage, drug), axes: (month, competitor, cancer_type, stage/drug)
+    shape = (num_months, num_comp, num_ctype, num_stage_drug)
+    # Variation factor so not all (ctype,stage,drug) are identical
+    sales = base_value[:, :, None, None] * rng.uniform(0.8, 1.2, size=shape)
+    # Add random noise (± 5%)
+    sales *= 1 + rng.uniform(-0.05, 0.05, size=shape)
+    # Ensure no negative
+    np.maximum(sales, 0, out=sales)
+    sales = np.rint(sales).astype(np.int32).ravel()
+
+    # Label columns in the same (month, competitor, cancer_type, stage/drug) order,
+    # built from integer codes: labels are categoricals, stage stays numeric
+    stages = np.array([stage for stage, _ in stage_drugs], dtype=np.int8)
+    drug_names = list(dict.fromkeys(drug for _, drug in stage_drugs))
+    drug_codes = np.array([drug_names.index(drug) for _, drug in stage_drugs], dtype=np.int8)
+    month_codes = np.arange(num_months, dtype=np.int16)
+    comp_codes = np.arange(num_comp, dtype=np.int8)
+    ctype_codes = np.arange(num_ctype, dtype=np.int8)
+    df = pd.DataFrame({
+        "month": pd.Categorical.from_codes(
+            np.repeat(month_codes, num_comp * num_ctype * num_stage_drug),
+            categories=month_strs
+        ),
+        "competitor": pd.Categorical.from_codes(
+            np.tile(np.repeat(comp_codes, num_ctype * num_stage_drug), num_months),
+            categories=COMPETITORS
+        ),
+        "cancer_type": pd.Categorical.from_codes(
+            np.tile(np.repeat(ctype_codes, num_stage_drug), num_months * num_comp),
+            categories=CANCER_TYPES
+        ),
+        "stage": np.tile(stages, num_months * num_comp * num_ctype),
+        "drug": pd.Categorical.from_codes(
+            np.tile(drug_codes, num_months * num_comp * num_ctype),
+            categories=drug_names
+        ),
+        "sales": sales
+    })
     return df
 
 
@@ -139,13 +164,29 @@ def generate_competitor_sales_data_scurve_with_decline(
 # Example usage
 # =======================
 
-df_sales = generate_competitor_sales_data_scurve_with_decline(
-    start_month="2014-01", 
-    end_month="2024-06"
-)
-
-print("Sample competitor sales data (growth + decline curve):")
-print(df_sales.head(20))
-print(f"\nTotal rows = {len(df_sales)}")
+def __getattr__(name):
+    """
+    Build the example df_sales (2014-01 .. 2024-06) on first access instead
+    of at import; it is cached as a module global.
+    """
+    if name == "df_sales":
+        global df_sales
+        df_sales = generate_competitor_sales_data_scurve_with_decline(
+            start_month="2014-01",
+            end_month="2024-06"
+        )
+        return df_sales
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+if __name__ == "__main__":
+    df_sales = generate_competitor_sales_data_scurve_with_decline(
+        start_month="2014-01", 
+        end_month="2024-06"
+    )
+
+    print("Sample competitor sales data (growth + decline curve):")
+    print(df_sales.head(20))
+    print(f"\nTotal rows = {len(df_sales)}")
 
     # You can pivot, plot, or export the DataFrame as needed.
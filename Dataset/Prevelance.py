@@ -1,6 +1,9 @@
-import random
+import numpy as np
 import pandas as pd
 
+# Default generator of create_multi_cancer_prevalence_dataset (see its seed)
+_RNG = np.random.default_rng()
+
 US_STATES = [
     "AL","AK","AZ","AR","CA","CO","CT","DE","FL","GA","HI","ID","IL","IN","IA",
     "KS","KY","LA","ME","MD","MA","MI","MN","MS","MO","MT","NE","NV","NH","NJ",
@@ -15,6 +18,9 @@ US_REGIONS = {
     "West":      ["AK","AZ","CA","CO","HI","ID","MT","NV","NM","OR","UT","WA","WY"]
 }
 
+# US_REGIONS inverted: state abbreviation -> region
+STATE_TO_REGION = {state: region for region, states in US_REGIONS.items() for state in states}
+
 CANCER_TYPES = [
     "Lung Cancer",
     "Breast Cancer",
@@ -28,16 +34,38 @@ def assign_region(state_abbr):
     """
     Return a region name (Northeast, Midwest, South, West) for a given state abbreviation.
     """
-    for region, states in US_REGIONS.items():
-        if state_abbr in states:
-            return region
-    return "Unknown"
+    return STATE_TO_REGION.get(state_abbr, "Unknown")
+
+# Base (min, max) ranges of the yearly incidence and mortality counts per cancer
+CANCER_BASE_RANGES = {
+    "Lung Cancer":       {"incidence": (500, 6000),  "mortality": (200, 4500)},
+    "Breast Cancer":     {"incidence": (1000, 7000), "mortality": (300, 3000)},
+    "Prostate Cancer":   {"incidence": (800, 5000),  "mortality": (200, 2000)},
+    "Colorectal Cancer": {"incidence": (700, 4000),  "mortality": (200, 1500)},
+    "Leukemia":          {"incidence": (300, 2000),  "mortality": (100, 1000)},
+    "Lymphoma":          {"incidence": (300, 2200),  "mortality": (100, 800)}
+}
+# Fallback for cancer types without their own entry
+DEFAULT_BASE_RANGES = {"incidence": (500, 5000), "mortality": (200, 2000)}
+
+# The same ranges as int32 (min, max) tables with one row per CANCER_TYPES
+# entry (see CANCER_TO_IDX) and DEFAULT_BASE_RANGES as the last row.
+CANCER_TO_IDX = {cancer: i for i, cancer in enumerate(CANCER_TYPES)}
+BASE_INCIDENCE = np.array(
+    [CANCER_BASE_RANGES[cancer]["incidence"] for cancer in CANCER_TYPES] + [DEFAULT_BASE_RANGES["incidence"]],
+    dtype=np.int32
+)
+BASE_MORTALITY = np.array(
+    [CANCER_BASE_RANGES[cancer]["mortality"] for cancer in CANCER_TYPES] + [DEFAULT_BASE_RANGES["mortality"]],
+    dtype=np.int32
+)
 
 def create_multi_cancer_prevalence_dataset(
     start_year=2018,
     end_year=2025,
     states=None,
-    cancer_types=None
+    cancer_types=None,
+    seed=None
 ):
     """
     Create a synthetic dataset showing prevalence/incidence/mortality
@@ -48,6 +76,7 @@ def create_multi_cancer_prevalence_dataset(
     :param end_year:     Last year of data
     :param states:       A list of state abbreviations. If None, uses all US_STATES.
     :param cancer_types: A list of cancer types to simulate. If None, uses CANCER_TYPES.
+    :param seed:         Seed for reproducible data. If None, uses the module's generator.
     :return: pandas DataFrame with columns:
 
         [
@@ -63,72 +92,89 @@ def create_multi_cancer_prevalence_dataset(
     if cancer_types is None:
         cancer_types = CANCER_TYPES
 
-    all_rows = []
-
-    for year in range(start_year, end_year + 1):
-        for state in states:
-            region = assign_region(state)
-            
-            # Synthetic total population for the state in that year
-            population = random.randint(200_000, 40_000_000)
-
-            for cancer in cancer_types:
-                # Base ranges vary by cancer
-                if cancer == "Lung Cancer":
-                    base_incidence_min, base_incidence_max = (500, 6000)
-                    base_mort_min,     base_mort_max       = (200, 4500)
-                elif cancer == "Breast Cancer":
-                    base_incidence_min, base_incidence_max = (1000, 7000)
-                    base_mort_min,     base_mort_max       = (300, 3000)
-                elif cancer == "Prostate Cancer":
-                    base_incidence_min, base_incidence_max = (800, 5000)
-                    base_mort_min,     base_mort_max       = (200, 2000)
-                elif cancer == "Colorectal Cancer":
-                    base_incidence_min, base_incidence_max = (700, 4000)
-                    base_mort_min,     base_mort_max       = (200, 1500)
-                elif cancer == "Leukemia":
-                    base_incidence_min, base_incidence_max = (300, 2000)
-                    base_mort_min,     base_mort_max       = (100, 1000)
-                elif cancer == "Lymphoma":
-                    base_incidence_min, base_incidence_max = (300, 2200)
-                    base_mort_min,     base_mort_max       = (100, 800)
-                else:
-                    # Fallback
-                    base_incidence_min, base_incidence_max = (500, 5000)
-                    base_mort_min, base_mort_max = (200, 2000)
-
-                # Generate random incidence / mortality
-                incidence_count  = random.randint(base_incidence_min, base_incidence_max)
-                mortality_count  = random.randint(base_mort_min, min(incidence_count, base_mort_max))
-
-                # For prevalence, assume up to 5x incidence
-                prevalence_count = random.randint(incidence_count, incidence_count * 5)
-
-                # Calculate rates per 100k
-                prevalence_rate = round((prevalence_count / population) * 100_000, 2)
-                incidence_rate  = round((incidence_count  / population) * 100_000, 2)
-                mortality_rate  = round((mortality_count  / population) * 100_000, 2)
-
-                # Randomly pick a cancer stage from 1 to 4
-                cancer_stage = random.randint(1, 4)
-
-                row = {
-                    "year":             pd.to_datetime(str(year) + '-01-01'),
-                    "state":            state,
-                    "region":           region,
-                    "cancer_type":      cancer,
-                    "cancer_stage":     cancer_stage,
-                    "population":       population,
-                    "prevalence_count": prevalence_count,
-                    "prevalence_rate":  prevalence_rate,
-                    "incidence_count":  incidence_count,
-                    "incidence_rate":   incidence_rate,
-                    "mortality_count":  mortality_count,
-                    "mortality_rate":   mortality_rate
-                }
-                all_rows.append(row)
-    
-    df = pd.DataFrame(all_rows)
+    rng = _RNG if seed is None else np.random.default_rng(seed)
+
+    years = np.arange(start_year, end_year + 1)
+    num_years, num_states, num_cancers = len(years), len(states), len(cancer_types)
+    num_rows = num_years * num_states * num_cancers
+
+    # Rows are ordered by year, then state, then cancer type; every
+    # (year, state) pair shares one population draw.
+    year_idx = np.repeat(np.arange(num_years), num_states * num_cancers)
+    state_idx = np.tile(np.repeat(np.arange(num_states), num_cancers), num_years)
+    cancer_idx = np.tile(np.arange(num_cancers), num_years * num_states)
+
+    # Synthetic total population for each state in each year
+    population = np.repeat(
+        rng.integers(200_000, 40_000_000, size=num_years * num_states, dtype=np.int32, endpoint=True),
+        num_cancers
+    )
+
+    # Base ranges vary by cancer (unknown ones use the fallback row);
+    # every count fits comfortably in int32
+    range_idx = np.array([CANCER_TO_IDX.get(cancer, -1) for cancer in cancer_types], dtype=np.intp)
+    incidence_min, incidence_max = BASE_INCIDENCE[range_idx].T
+    mort_min, mort_max = BASE_MORTALITY[range_idx].T
+
+    # Generate random incidence / mortality
+    incidence_count = rng.integers(
+        incidence_min[cancer_idx], incidence_max[cancer_idx], dtype=np.int32, endpoint=True
+    )
+    mortality_count = rng.integers(
+        mort_min[cancer_idx], np.minimum(incidence_count, mort_max[cancer_idx]),
+        dtype=np.int32, endpoint=True
+    )
+
+    # For prevalence, assume up to 5x incidence
+    prevalence_count = rng.integers(
+        incidence_count, incidence_count * 5, dtype=np.int32, endpoint=True
+    )
+
+    # Jan 1 of every year, generated directly as datetime64 values
+    year_starts = pd.date_range(f"{start_year}-01-01", periods=num_years, freq="YS").to_numpy()
+
+    # Randomly pick a cancer stage from 1 to 4
+    cancer_stage = rng.integers(1, 4, size=num_rows, dtype=np.int8, endpoint=True)
+
+    # Calculate rates per 100k: every rate goes through one preallocated
+    # float64 buffer and is rounded there before being stored as float32
+    rates = {}
+    scratch = np.empty(num_rows)
+    for name, count in (
+        ("prevalence_rate", prevalence_count),
+        ("incidence_rate", incidence_count),
+        ("mortality_rate", mortality_count)
+    ):
+        np.divide(count, population, out=scratch)
+        np.multiply(scratch, 100_000, out=scratch)
+        np.round(scratch, 2, out=scratch)
+        rates[name] = scratch.astype(np.float32)
+
+    # State, region and cancer type are categoricals over the row indices.
+    # Repeated states / cancer types each still get their own rows, but
+    # share one category.
+    state_names = list(dict.fromkeys(states))
+    state_codes = np.array([state_names.index(state) for state in states], dtype=np.int16)
+    cancer_names = list(dict.fromkeys(cancer_types))
+    cancer_codes = np.array([cancer_names.index(cancer) for cancer in cancer_types], dtype=np.int16)
+    regions = [assign_region(state) for state in states]
+    region_names = list(dict.fromkeys(list(US_REGIONS) + regions))
+    region_codes = np.array([region_names.index(region) for region in regions], dtype=np.int8)
+
+    df = pd.DataFrame({
+        "year":             year_starts[year_idx],
+        "state":            pd.Categorical.from_codes(state_codes[state_idx], categories=state_names),
+        "region":           pd.Categorical.from_codes(region_codes[state_idx], categories=region_names),
+        "cancer_type":      pd.Categorical.from_codes(cancer_codes[cancer_idx], categories=cancer_names),
+        "cancer_stage":     cancer_stage,
+        "population":       population,
+        "prevalence_count": prevalence_count,
+        "prevalence_rate":  rates["prevalence_rate"],
+        "incidence_count":  incidence_count,
+        "incidence_rate":   rates["incidence_rate"],
+        "mortality_count":  mortality_count,
+        "mortality_rate":   rates["mortality_rate"]
+    })
     return df
 
 # ------------------------------------------------------------------------
@@ -136,6 +182,8 @@ def create_multi_cancer_prevalence_dataset(
 # multi_cancer_df = create_multi_cancer_prevalence_dataset(start_year=2018, end_year=2025)
 # multi_cancer_df.head()
 # ------------------------------------------------------------------------
-print("EPI BASED DATA ---------------------------------------")
 df_epi = create_multi_cancer_prevalence_dataset(start_year=2014, end_year=2021)
-print(df_epi.head())
\ No newline at end of file
+
+if __name__ == "__main__":
+    print("EPI BASED DATA ---------------------------------------")
+    print(df_epi.head())
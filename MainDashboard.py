@@ -1,3 +1,5 @@
+import logging
+
 import numpy as np
 import pandas as pd
 import panel as pn
@@ -7,11 +9,9 @@ from bokeh.plotting import figure
 from bokeh.models import ColumnDataSource
 from bokeh.palettes import Category10, Category20, Viridis256, Inferno256
 
-from datetime import datetime, timedelta
 import datetime as dt
+from functools import lru_cache
 
-from Dataset.MarketDatasets import df_sales
-from Dataset.DataGen import df_claims, df_ehr, df_registry, df_rwe, df_tcga
 from Dataset.Prevelance import df_epi
 
 # Types and Categories 
@@ -25,31 +25,16 @@ from Dataset.DataGen import GENE_LIST
 
 pn.extension()
 
-# -----------------------------------------------------------------------------
-# Create a synthetic DataFrame
-# -----------------------------------------------------------------------------
+# Callback tracing; debug messages are only formatted when enabled
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
 
-# Date range
-dates = pd.date_range(start="2014-01-01", periods=180, freq="M")
+# Line colors of the epi charts
 COLORS = [
     '#8AB1D2', '#FD9F5F', '#E47D78', '#9E7EDE', '#5DAEFF',
     '#447EAE', '#EF6303', '#CA3028', '#6131C1', '#0079F2',
 ]
 
-# Some categories and sub-groups
-categories = ["Alpha", "Beta", "Gamma"]
-groups = ["Group 1", "Group 2", "Group 3"]
-
-df = pd.DataFrame({
-    "date": np.random.choice(dates, 500),
-    "category": np.random.choice(categories, 500),
-    "group": np.random.choice(groups, 500),
-    "value": np.random.randn(500).cumsum()  # random walk for demonstration
-})
-
-# Ensure DataFrame is sorted by date for clarity
-df = df.sort_values("date").reset_index(drop=True)
-
 # -----------------------------------------------------------------------------
 # Define widgets
 # -----------------------------------------------------------------------------
@@ -126,105 +111,141 @@ simulate_button = pn.widgets.Button(name='Simulate', button_type='primary')
 
 
 # -----------------------------------------------------------------------------
-# Helper function to filter DataFrame based on widget values
+# Precomputed sums of df_epi per (year, cancer_type, cancer_stage)
 # -----------------------------------------------------------------------------
-def filter_epi_data(df, date_range, cancer_types, cancer_stages):
-    """Return a filtered DataFrame based on date range and selected categories/groups."""
+EPI_METRICS = ["prevalence_count", "incidence_count"]
+
+def build_epi_cube(df):
+    """
+    Sum the EPI_METRICS of df into a cube indexed [year, cancer_type,
+    cancer_stage - 1, metric], along with the number of rows behind every
+    (year, cancer_type, cancer_stage) cell. Years are df's sorted unique
+    years; cancer types follow the column's categories.
+    """
+    years = np.unique(df["year"].to_numpy())
+    index = (
+        np.searchsorted(years, df["year"].to_numpy()),
+        df["cancer_type"].cat.codes.to_numpy(),
+        df["cancer_stage"].to_numpy() - 1
+    )
+    shape = (len(years), len(df["cancer_type"].cat.categories), int(df["cancer_stage"].to_numpy().max(initial=0)))
+
+    sums = np.zeros(shape + (len(EPI_METRICS),), dtype=np.int64)
+    np.add.at(sums, index, df[EPI_METRICS].to_numpy())
+    rows = np.zeros(shape, dtype=np.int64)
+    np.add.at(rows, index, 1)
+    return years, sums, rows
+
+epi_years, epi_cube, epi_cube_rows = build_epi_cube(df_epi)
+
+@lru_cache(maxsize=32)
+def aggregate_epi_data(date_range, cancer_types, cancer_stages):
+    """
+    Yearly prevalence and incidence sums per cancer type of df_epi for the
+    given filters, sliced out of the precomputed epi cube. Cached, so both
+    tabs share one computation per change; arguments must be hashable (tuples).
+    """
     start_date, end_date = date_range
-    mask = (
-        (df["year"] >= pd.to_datetime(start_date)) &
-        (df["year"] <= pd.to_datetime(end_date)) &
-        (df["cancer_type"].isin(cancer_types)) &
-        (df["cancer_stage"].isin(cancer_stages))
+    year_mask = (
+        (epi_years >= pd.to_datetime(start_date).to_datetime64()) &
+        (epi_years <= pd.to_datetime(end_date).to_datetime64())
     )
-    print("MASK----------WORKING------#########")
-    return df[mask]
+    cancer_mask = df_epi["cancer_type"].cat.categories.isin(cancer_types)
+    stage_mask = np.isin(np.arange(1, epi_cube.shape[2] + 1), cancer_stages)
+
+    sums = epi_cube[year_mask][:, cancer_mask][:, :, stage_mask].sum(axis=2)
+    rows = epi_cube_rows[year_mask][:, cancer_mask][:, :, stage_mask].sum(axis=2)
+
+    # Keep only the (year, cancer_type) pairs that have matching rows
+    year_idx, cancer_idx = np.nonzero(rows)
+    return pd.DataFrame({
+        "year": epi_years[year_mask][year_idx],
+        "cancer_type": pd.Categorical.from_codes(
+            np.flatnonzero(cancer_mask)[cancer_idx], dtype=df_epi["cancer_type"].dtype
+        ),
+        **{metric: sums[year_idx, cancer_idx, i] for i, metric in enumerate(EPI_METRICS)}
+    })
 
 # -----------------------------------------------------------------------------
-# Define Bokeh chart update functions
+# Define Bokeh charts and their update functions
 # -----------------------------------------------------------------------------
-@pn.depends(
-    date_slider.param.value,
-    multi_cancer_type.param.value,
-    multi_cancer_stage.param.value
-)
-def prevelance_tab(date_range, selected_categories, selected_groups):
+def epi_line_chart(title, y_label):
     """
-    Tab 1: A line chart showing sum of 'value' by date.
+    A yearly line chart drawn by a single multi_line glyph. Returns the figure
+    and its ColumnDataSource, which callbacks refill in place (see epi_series).
     """
-    filtered = filter_epi_data(df_epi, date_range, selected_categories, selected_groups)
-
-    # Aggregate by date
-    agg = filtered.groupby(["year", "cancer_type"])['prevalence_count'].sum().reset_index()
-
-    print("Filtered Data  ############################")
-    print(agg)
-
-    # Create a Bokeh figure
+    source = ColumnDataSource({"xs": [], "ys": [], "color": [], "cancer_type": []})
     p = figure(
         width=700, height=400, 
         x_axis_type="datetime", 
-        title="Tab 1: Yearly Prevelance data for cancer"
+        title=title
     )
-
-    cancer_types = list(agg['cancer_type'].unique())
+    p.multi_line("xs", "ys", legend_field="cancer_type", source=source, line_width=2, line_color="color")
+    p.xaxis.axis_label = "Year"
+    p.yaxis.axis_label = y_label
+    return p, source
+
+def epi_series(agg, metric):
+    """Data for an epi_line_chart source: one line of 'metric' per cancer type in agg."""
+    # One column per cancer type, indexed by year; like agg itself, the pivot
+    # only holds observed cancer types, never empty category columns
+    series = agg.pivot(index="year", columns="cancer_type", values=metric)
+    cancer_types = list(series.columns)
     num_cancer_types = len(cancer_types)
-    print(num_cancer_types, cancer_types)
+    logger.debug("%d cancer types: %s", num_cancer_types, cancer_types)
     palette = COLORS
 
+    return {
+        "xs": [series.index.to_numpy()] * num_cancer_types,
+        "ys": [series[cancer_type].to_numpy() for cancer_type in cancer_types],
+        "color": palette[:num_cancer_types],
+        "cancer_type": cancer_types
+    }
 
-    for i,cancer_type in enumerate(cancer_types) :
-        source = ColumnDataSource(agg[agg["cancer_type"] == cancer_type])
-        line = p.line("year", "prevalence_count", legend_label=cancer_type, source=source, line_width=2, color=palette[i])
-
+# The figures are built once; widget changes only replace their data
+prevalence_figure, prevalence_source = epi_line_chart(
+    "Tab 1: Yearly Prevelance data for cancer", "Prevalence Count"
+)
+incidence_figure, incidence_source = epi_line_chart(
+    "Tab 2: Yearly Incidence data for cancer", "Incidence Count"
+)
 
-    # p.circle("date", "value", source=source, size=6, color="navy")
-    p.xaxis.axis_label = "Year"
-    p.yaxis.axis_label = "Prevalence Count"
+@pn.depends(
+    date_slider.param.value,
+    multi_cancer_type.param.value,
+    multi_cancer_stage.param.value,
+    watch=True
+)
+def prevelance_tab(date_range, selected_categories, selected_groups):
+    """
+    Tab 1: Update the prevalence chart with the yearly prevalence per cancer type.
+    """
+    # Aggregate by date (shared with the other tab)
+    agg = aggregate_epi_data(tuple(date_range), tuple(selected_categories), tuple(selected_groups))
+    logger.debug("Aggregated epi data:\n%s", agg)
 
-    return p
+    prevalence_source.data = epi_series(agg, "prevalence_count")
 
 
 @pn.depends(
     date_slider.param.value,
     multi_cancer_type.param.value,
-    multi_cancer_stage.param.value
+    multi_cancer_stage.param.value,
+    watch=True
 )
 def incidence_tab(date_range, selected_categories, selected_groups):
     """
-    Tab 1: A line chart showing sum of 'value' by date.
+    Tab 2: Update the incidence chart with the yearly incidence per cancer type.
     """
-    filtered = filter_epi_data(df_epi, date_range, selected_categories, selected_groups)
-
-    # Aggregate by date
-    agg = filtered.groupby(["year", "cancer_type"])['incidence_count'].sum().reset_index()
+    # Aggregate by date (shared with the other tab)
+    agg = aggregate_epi_data(tuple(date_range), tuple(selected_categories), tuple(selected_groups))
+    logger.debug("Aggregated epi data:\n%s", agg)
 
-    print("Filtered Data  ############################")
-    print(agg)
-
-    # Create a Bokeh figure
-    p = figure(
-        width=700, height=400, 
-        x_axis_type="datetime", 
-        title="Tab 2: Yearly Incidence data for cancer"
-    )
-
-    cancer_types = list(agg['cancer_type'].unique())
-    num_cancer_types = len(cancer_types)
-    print(num_cancer_types, cancer_types)
-    palette = COLORS
-
-
-    for i,cancer_type in enumerate(cancer_types) :
-        source = ColumnDataSource(agg[agg["cancer_type"] == cancer_type])
-        line = p.line("year", "incidence_count", legend_label=cancer_type, source=source, line_width=2, color=palette[i])
-
-
-    # p.circle("date", "value", source=source, size=6, color="navy")
-    p.xaxis.axis_label = "Year"
-    p.yaxis.axis_label = "Incidence Count"
+    incidence_source.data = epi_series(agg, "incidence_count")
 
-    return p
+# Fill both charts for the initial widget values
+prevelance_tab(date_slider.value, multi_cancer_type.value, multi_cancer_stage.value)
+incidence_tab(date_slider.value, multi_cancer_type.value, multi_cancer_stage.value)
 
 
 
@@ -284,8 +305,7 @@ def patient_segmentation(df):
     multi_cancer_stage.param.value
 )
 def updateData(one, two, three):
-    print("Updating DataFrame Test ####################################")
-    print(one,two,three)
+    logger.debug("Updating data for %s, %s, %s", one, two, three)
 
     calculated_display = pn.Column(
         "First : **FIRST**",
@@ -312,7 +332,7 @@ market_simulation_tab = pn.Column(
 
 
 epi_plots = pn.Row(
-    prevelance_tab, incidence_tab
+    prevalence_figure, incidence_figure
 )
 
 epi_tab = pn.Column(